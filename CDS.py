@@ -101,19 +101,22 @@ class CDS(Instrument):
         :param forward_start_date: starting day of the CDS forward
         :return: returns the annuity of a CDS forward
         """
-        time_fraction =  (self._expiry_date - forward_start_date).days / self._day_count
+        time_fraction = self.year_fraction(forward_start_date, self._expiry_date, self._day_count)
         hazard_rate = spot/1e4/(1 - self._recovery)
         pv01 = (1 - np.exp(-(hazard_rate + rd )*time_fraction))/(hazard_rate + rd)*365/360
         return pv01
 
-    def forward_level(self, *, spot, rd, forward_start_date):
+    def forward_level(self, *, spot, rd, forward_start_date, horizon_dates=None):
         """
         :param spot: level of spot cds spread in bps/annum
         :param rd: flat interest rate for discounting, in practice, one uses the full ISDA swap curve for this
         :param forward_start_date: starting day of the CDS forward
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: level of forward, approximate but very good when compared to dealer calculations for 3 months and less
         """
-        time_fraction =  (forward_start_date - self._trade_date).days / self._day_count
+        start_date = self._trade_date if horizon_dates is None else np.asarray(horizon_dates, dtype='datetime64[us]')
+        # horizons past the forward start date see the forward as spot
+        time_fraction = np.maximum(self.year_fraction(start_date, forward_start_date, self._day_count), 0)
         pv01 = self.forward_annuity(spot=spot, rd=rd, forward_start_date=forward_start_date)
         return spot + spot* time_fraction/pv01
 
@@ -13,7 +13,8 @@ class CDSSwaption(Option):
     Price based options on CDXHY can also be priced by first converting price based spot and strike levels into
     spread based levels
     """
-
+    # pv and greeks are quoted in bps upfront, i.e. per 10000 notional
+    notional_unit = 1e4
 
     def __init__(self, *, name, trade_date,
                  expiry_date, pay_or_rec, strike,
@@ -24,76 +25,77 @@ class CDSSwaption(Option):
     def __str__(self):
         return super().__str__()
 
-    def pv(self, *, spot, sigma, rd, cds):
+    def pv(self, *, spot, sigma, rd, cds, horizon_dates=None):
         """
         :param spot: level of spot cds spread in bps/annum
         :param sigma: Log Normal Implied Volatility in percentage points/Year,16% Annual Volatility should be input as 16/100
         :param rd: flat interest rate for discounting, in practice, one uses the full ISDA swap curve for this
         :param cds: cds object with cds details like maturity, recovery
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: returns the pv in bps upfront for cds swaption
         """
 
-        time_to_expiry = (self._expiry_date - self._trade_date).days / self._day_count
+        time_to_expiry = self.time_to_expiry(horizon_dates=horizon_dates)
 
         forward_annuity_at_spot = cds.forward_annuity(spot=spot, rd=rd, forward_start_date=self._expiry_date)
         forward_annuity_at_strike = cds.forward_annuity(spot=self._strike, rd=rd, forward_start_date=self._expiry_date)
-        forward = cds.forward_level(spot=spot, rd=rd, forward_start_date=self._expiry_date)
+        forward = cds.forward_level(spot=spot, rd=rd, forward_start_date=self._expiry_date,
+                                    horizon_dates=horizon_dates)
         hazard = cds.hazard_rate(spot=spot)
 
         adjusted_strike = cds.coupon + (self._strike - cds.coupon) * (
                     forward_annuity_at_strike / forward_annuity_at_spot /
                     np.exp(-hazard * time_to_expiry))
 
-        if self._call_or_put.lower() in ['pay', 'payer', 'call', 'c']:
-            call_or_put = 'call'
-        elif self._call_or_put.lower() in ['rec', 'receiver', 'put', 'p']:
-            call_or_put = 'put'
-        price = super().blackscholes(forward, adjusted_strike, time_to_expiry, sigma, call_or_put)
+        price = super().blackscholes(forward, adjusted_strike, time_to_expiry, sigma, self._call_or_put)
         price = price * forward_annuity_at_spot
         return price
 
-    def delta(self, *, spot, sigma, rd, cds, bump=10):
+    def delta(self, *, spot, sigma, rd, cds, bump=10, horizon_dates=None):
         """
         :param spot: level of spot cds spread in bps/annum
         :param sigma: Log Normal Implied Volatility in percentage points/Year,16% Annual Volatility should be input as 16/100
         :param rd: flat interest rate for discounting, in practice, one uses the full ISDA swap curve for this
         :param cds: cds object with cds details like maturity, recovery
         :param bump: amount by which underlying is shifted to calculate numerical delta
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: delta, so a return of 2.5 means 250,000 dollars/basis point/1BB notional of the swaption
         """
 
-        pv_up = self.pv(spot=spot + bump, sigma=sigma, rd=rd, cds=cds)
-        pv_down = self.pv(spot=spot - bump, sigma=sigma, rd=rd, cds=cds)
+        pv_up = self.pv(spot=spot + bump, sigma=sigma, rd=rd, cds=cds, horizon_dates=horizon_dates)
+        pv_down = self.pv(spot=spot - bump, sigma=sigma, rd=rd, cds=cds, horizon_dates=horizon_dates)
 
         return (pv_up - pv_down) / bump / 2.0
 
-    def gamma(self, *, spot, sigma, rd, cds, bump=10):
+    def gamma(self, *, spot, sigma, rd, cds, bump=10, horizon_dates=None):
         """
         :param spot: level of spot cds spread in bps/annum
         :param sigma: Log Normal Implied Volatility in percentage points/Year,16% Annual Volatility should be input as 16/100
         :param rd: flat interest rate for discounting, in practice, one uses the full ISDA swap curve for this
         :param cds: cds object with cds details like maturity, recovery
         :param bump: amount by which underlying is shifted to calculate numerical gamma
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: gamma, so a return of 0.144 means 14,400 dv01/basis point/1BB notional of the swaption
         """
 
-        delta_up = self.delta(spot=spot + bump, sigma=sigma, rd=rd, cds=cds)
-        delta_down = self.delta(spot=spot - bump, sigma=sigma, rd=rd, cds=cds)
+        delta_up = self.delta(spot=spot + bump, sigma=sigma, rd=rd, cds=cds, horizon_dates=horizon_dates)
+        delta_down = self.delta(spot=spot - bump, sigma=sigma, rd=rd, cds=cds, horizon_dates=horizon_dates)
 
         return (delta_up - delta_down) / bump / 2
 
-    def vega(self, *, spot, sigma, rd, cds, bump=1):
+    def vega(self, *, spot, sigma, rd, cds, bump=1, horizon_dates=None):
         """
         :param spot: level of spot cds spread in bps/annum
         :param sigma: Log Normal Implied Volatility in percentage points/Year,16% Annual Volatility should be input as 16/100
         :param rd: flat interest rate for discounting, in practice, one uses the full ISDA swap curve for this
         :param cds: cds object with cds details like maturity, recovery
         :param bump: amount by which underlying is shifted to calculate numerical gamma
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: vega, so a return of 0.367 means 36,700 dollars/volatility point/1BB notional of the swaption
           """
 
-        pv_up = self.pv(spot=spot, sigma=sigma + bump / 100, rd=rd, cds=cds)
-        pv_down = self.pv(spot=spot, sigma=sigma - bump / 100, rd=rd, cds=cds)
+        pv_up = self.pv(spot=spot, sigma=sigma + bump / 100, rd=rd, cds=cds, horizon_dates=horizon_dates)
+        pv_down = self.pv(spot=spot, sigma=sigma - bump / 100, rd=rd, cds=cds, horizon_dates=horizon_dates)
 
         return (pv_up - pv_down) / bump / 2
 
@@ -127,3 +129,9 @@ if __name__ == '__main__':
     print('DV01 for ATM rec: ', cdxig_rec.delta(spot=59.5, sigma=56 / 100, rd=2.2 / 100, cds=cdxig, bump=1))
     print('Gamma for  rec: ', cdxig_rec.gamma(spot=59.5, sigma=56 / 100, rd=2.2 / 100, cds=cdxig, bump=1))
     print('Vega for  rec: ', cdxig_rec.vega(spot=59.5, sigma=56 / 100, rd=2.2 / 100, cds=cdxig))
+
+    horizon_dates = [datetime.datetime(2019, 8, 6) + datetime.timedelta(days=day) for day in range(0, 44, 7)]
+    horizon = CDSSwaption.horizon(options=[cdxig_payer, cdxig_rec], horizon_dates=horizon_dates,
+                                  spot=59.5, sigma=56 / 100, rd=2.2 / 100, cds=cdxig, bumps={'delta': 1, 'gamma': 1})
+    print('\nPV decay of payer and rec to expiry: \n', horizon['pv'])
+    print('DV01 of payer and rec to expiry: \n', horizon['delta'])
@@ -14,66 +14,66 @@ class EquityIndexOption(Option):
     def __str__(self):
         return super().__str__()
 
-    def pv(self, *, spot, sigma, rd, rf):
+    def pv(self, *, spot, sigma, rd, rf, horizon_dates=None):
         """
         :param spot: underlying spot rate
         :param sigma: annual log normal volatility year, 16% Annual Volatility should be input as 16/100
         :param rd: cost of funding/risk-free rate, 2% Annual Rate should be input as 2.0/100.0
         :param rf: Annualized dividend rate, 2% Annual dividends should be input as 2.0/100
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: price in points of index
         """
 
-        time_to_expiry = (self._expiry_date - self._trade_date).days / self._day_count
+        time_to_expiry = self.time_to_expiry(horizon_dates=horizon_dates)
 
-        if self._call_or_put.lower() in ['pay', 'payer', 'call', 'c']:
-            call_or_put = 'call'
-        elif self._call_or_put.lower() in ['rec', 'receiver', 'put', 'p']:
-            call_or_put = 'put'
         forward = spot * np.exp((rd - rf) * time_to_expiry)
-        price = super().blackscholes(forward, self._strike, time_to_expiry, sigma, call_or_put)
+        price = super().blackscholes(forward, self._strike, time_to_expiry, sigma, self._call_or_put)
         price = price * np.exp(-rd * time_to_expiry)
         return price
 
-    def delta(self, *, spot, sigma, rd, rf, bump=10):
+    def delta(self, *, spot, sigma, rd, rf, bump=10, horizon_dates=None):
         """
         :param spot: underlying spot rate
         :param sigma: annual log normal volatility year, 16% Annual Volatility should be input as 16/100
         :param rd: cost of funding/risk-free rate, 2% Annual Rate should be input as 2.0/100.0
         :param rf: Annualized dividend rate, 2% Annual dividends should be input as 2.0/100
         :param bump: amount by which underlying is shifted to calculate numerical delta
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: delta in absolute units, so a returned value of 0.5 means 50 delta
        """
-        pv_up = self.pv(spot=spot + bump, sigma=sigma, rd=rd, rf=rf)
-        pv_down = self.pv(spot=spot - bump, sigma=sigma, rd=rd, rf=rf)
+        pv_up = self.pv(spot=spot + bump, sigma=sigma, rd=rd, rf=rf, horizon_dates=horizon_dates)
+        pv_down = self.pv(spot=spot - bump, sigma=sigma, rd=rd, rf=rf, horizon_dates=horizon_dates)
 
         return (pv_up - pv_down) / bump / 2.0
 
-    def gamma(self, *, spot, sigma, rd, rf, bump=10):
+    def gamma(self, *, spot, sigma, rd, rf, bump=10, horizon_dates=None):
         """
         :param spot: underlying spot rate
         :param sigma: annual log normal volatility year, 16% Annual Volatility should be input as 16/100
         :param rd: cost of funding/risk-free rate, 2% Annual Rate should be input as 2.0/100.0
         :param rf: Annualized dividend rate, 2% Annual dividends should be input as 2.0/100
         :param bump: amount by which underlying is shifted to calculate numerical gamma
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: gamma in units of delta
         """
-        delta_up = self.delta(spot=spot + bump, sigma=sigma, rd=rd, rf=rf)
-        delta_down = self.delta(spot=spot - bump, sigma=sigma, rd=rd, rf=rf)
+        delta_up = self.delta(spot=spot + bump, sigma=sigma, rd=rd, rf=rf, horizon_dates=horizon_dates)
+        delta_down = self.delta(spot=spot - bump, sigma=sigma, rd=rd, rf=rf, horizon_dates=horizon_dates)
 
         return (delta_up - delta_down) / bump / 2
 
-    def vega(self, *, spot, sigma, rd, rf, bump=1):
+    def vega(self, *, spot, sigma, rd, rf, bump=1, horizon_dates=None):
         """
         :param spot: underlying spot rate
         :param sigma: annual log normal volatility year, 16% Annual Volatility should be input as 16/100
         :param rd: cost of funding/risk-free rate, 2% Annual Rate should be input as 2.0/100.0
         :param rf: Annualized dividend rate, 2% Annual dividends should be input as 2.0/100
         :param bump: amount by which volatility is shifted to calculate numerical vega
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: the returned value is vega/1 percentage point for 1 unit of underlying
         """
 
-        pv_up = self.pv(spot=spot, sigma=sigma + bump / 100, rd=rd, rf=rf)
-        pv_down = self.pv(spot=spot, sigma=sigma - bump / 100, rd=rd, rf=rf)
+        pv_up = self.pv(spot=spot, sigma=sigma + bump / 100, rd=rd, rf=rf, horizon_dates=horizon_dates)
+        pv_down = self.pv(spot=spot, sigma=sigma - bump / 100, rd=rd, rf=rf, horizon_dates=horizon_dates)
 
         return (pv_up - pv_down) / bump / 2
 
@@ -98,3 +98,9 @@ if __name__ == '__main__':
     print('delta for 1 unit of ATM put: ', spx_put.delta(spot=4400, sigma=16 / 100, rd=0.02, rf=0.02))
     print('gamma for 1 unit of ATM put: ', spx_put.gamma(spot=4400, sigma=16 / 100, rd=0.02, rf=0.02))
     print('vega for 1 unit of ATM put: ', spx_put.vega(spot=4400, sigma=16 / 100, rd=0.02, rf=0.02))
+
+    horizon_dates = [datetime.datetime(2017, 1, 31) + datetime.timedelta(days=day) for day in range(0, 366, 30)]
+    horizon = EquityIndexOption.horizon(options=[spx_call, spx_put], horizon_dates=horizon_dates,
+                                        spot=4400, sigma=16 / 100, rd=0.02, rf=0.02)
+    print('PV decay of ATM call and put to expiry: \n', horizon['pv'])
+    print('gamma of ATM call and put to expiry: \n', horizon['gamma'])
@@ -24,72 +24,74 @@ class FXOption(Option):
     def __str__(self):
         return super().__str__()
 
-    def pv(self, *, spot, sigma, rd, rf):
+    @property
+    def ccy(self):
+        return self._ccy
+
+    def _pv_in_foreign_ccy(self):
+        # casting the pair to 3 characters keeps the foreign currency, also elementwise on stacked books
+        return np.asarray(self._pv_ccy) == np.asarray(self._ccy).astype('<U3')
+
+    def pv(self, *, spot, sigma, rd, rf, horizon_dates=None):
         """
         :param spot: underlying spot rate
         :param sigma: annual log normal volatility year, 16% Annual Volatility should be input as 16/100
         :param rd: cost of funding in domestic currency, 2% Annual Rate should be input as 2.0/100.0
         :param rf: cost of funding in foreign currency, 2% Annual dividends should be input as 2.0/100
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: price in specified pv currency
         """
 
-        time_to_expiry = (self._expiry_date - self._trade_date).days / self._day_count
+        time_to_expiry = self.time_to_expiry(horizon_dates=horizon_dates)
 
-        if self._call_or_put.lower() in ['pay', 'payer', 'call', 'c']:
-            call_or_put = 'call'
-        elif self._call_or_put.lower() in ['rec', 'receiver', 'put', 'p']:
-            call_or_put = 'put'
         forward = spot * np.exp((rd - rf) * time_to_expiry)
-        price = super().blackscholes(forward, self._strike, time_to_expiry, sigma, call_or_put)
+        price = super().blackscholes(forward, self._strike, time_to_expiry, sigma, self._call_or_put)
         price = price * np.exp(-rd * time_to_expiry)
-        if self._pv_ccy == self._ccy[0:3]:
-            return price/spot
-        elif self._pv_ccy == self._ccy[3:6]:
-            return price
+        return price / np.where(self._pv_in_foreign_ccy(), spot, 1.0)
 
-    def delta(self, *, spot, sigma, rd, rf, bump=10):
+    def delta(self, *, spot, sigma, rd, rf, bump=10, horizon_dates=None):
         """
         :param spot: underlying spot rate
         :param sigma: annual log normal volatility year, 16% Annual Volatility should be input as 16/100
         :param rd: cost of funding/risk-free rate, 2% Annual Rate should be input as 2.0/100.0
         :param rf: Annualized dividend rate, 2% Annual dividends should be input as 2.0/100
         :param bump: amount by which underlying is shifted to calculate numerical delta
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: delta in absolute units, so a returned value of 0.5 means 50 delta
        """
-        pv_up = self.pv(spot=spot + bump, sigma=sigma, rd=rd, rf=rf)
-        pv_down = self.pv(spot=spot - bump, sigma=sigma, rd=rd, rf=rf)
+        pv_up = self.pv(spot=spot + bump, sigma=sigma, rd=rd, rf=rf, horizon_dates=horizon_dates)
+        pv_down = self.pv(spot=spot - bump, sigma=sigma, rd=rd, rf=rf, horizon_dates=horizon_dates)
         delta = (pv_up - pv_down) / bump / 2.0
 
-        if self._pv_ccy == self._ccy[0:3]:
-            return delta/bump*spot
-        elif self._pv_ccy == self._ccy[3:6]:
-            return delta
+        return delta * np.where(self._pv_in_foreign_ccy(), spot / bump, 1.0)
 
-    def gamma(self, *, spot, sigma, rd, rf, bump=10):
+    def gamma(self, *, spot, sigma, rd, rf, bump=10, horizon_dates=None):
         """
         :param spot: underlying spot rate
         :param sigma: annual log normal volatility year, 16% Annual Volatility should be input as 16/100
         :param rd: cost of funding/risk-free rate, 2% Annual Rate should be input as 2.0/100.0
         :param rf: Annualized dividend rate, 2% Annual dividends should be input as 2.0/100
         :param bump: amount by which underlying is shifted to calculate numerical gamma
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: gamma in units of delta
         """
-        delta_up = self.delta(spot=spot + bump, sigma=sigma, rd=rd, rf=rf, bump=bump)
-        delta_down = self.delta(spot=spot - bump, sigma=sigma, rd=rd, rf=rf, bump=bump)
+        delta_up = self.delta(spot=spot + bump, sigma=sigma, rd=rd, rf=rf, bump=bump, horizon_dates=horizon_dates)
+        delta_down = self.delta(spot=spot - bump, sigma=sigma, rd=rd, rf=rf, bump=bump, horizon_dates=horizon_dates)
 
         return (delta_up - delta_down) / bump / 2.
 
-    def vega(self, *, spot, sigma, rd, rf, bump=1):
+    def vega(self, *, spot, sigma, rd, rf, bump=1, horizon_dates=None):
         """
         :param forward: Forward is in basis points
         :param sigma: Sigma is Annual Black Normal Volatility in Basis Points/Yr
         :param annuity: Annuity is per 10000 Notional, so for a 10yr swap, approximately 10
         :param bump: the amount by which the sigma is bumped to calculate the numerical gamma, should be in vol points
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: the returned value is vega/1 percentage point for 1 unit of pv currency
         """
 
-        pv_up = self.pv(spot=spot, sigma=sigma + bump / 100, rd=rd, rf=rf)
-        pv_down = self.pv(spot=spot, sigma=sigma - bump / 100, rd=rd, rf=rf)
+        pv_up = self.pv(spot=spot, sigma=sigma + bump / 100, rd=rd, rf=rf, horizon_dates=horizon_dates)
+        pv_down = self.pv(spot=spot, sigma=sigma - bump / 100, rd=rd, rf=rf, horizon_dates=horizon_dates)
 
         return (pv_up - pv_down) / bump / 2
 
@@ -0,0 +1,299 @@
+from FXOption import FXOption
+from Instrument import Instrument
+from Options import MIN_TIME_TO_EXPIRY
+import datetime as datetime
+import numpy as np
+import scipy.stats as sp
+
+
+class FXSmile:
+    """
+    FX volatility smile built from market quotes by delta: ATM delta neutral straddle, 25 and 10 delta
+    risk reversals and butterflies for each expiry.
+    Delta conventions follow the pair and the pv currency of the quotes, in the same way as FXOption:
+    deltas are premium adjusted when premium is paid in the foreign currency ccy[0:3] and unadjusted otherwise,
+    spot deltas are used up to 1 year and forward deltas beyond.
+    Butterflies are treated as smile strangles, i.e. 25d call/put vols are atm + bf25 +/- rr25/2,
+    broker fly conventions will be implemented in future versions.
+    All conversions are vectorized, so pillar strikes for all expiries are solved together and vols for a whole
+    book of trades are interpolated in a single pass
+    """
+
+    def __init__(self, *, ccy, pv_ccy, trade_date, expiry_dates, spot, rd, rf,
+                 atm, rr25, bf25, rr10=None, bf10=None, day_count=365):
+        """
+        :param ccy: currency pair, eg 'EURUSD'
+        :param pv_ccy: currency in which the option premium is quoted, either currency of the pair
+        :param trade_date: date time
+        :param expiry_dates: list of expiry dates of the smile pillars, datetime
+        :param spot: underlying spot rate
+        :param rd: cost of funding in domestic currency per expiry, 2% Annual Rate should be input as 2.0/100.0
+        :param rf: cost of funding in foreign currency per expiry, 2% Annual Rate should be input as 2.0/100.0
+        :param atm: atm delta neutral straddle vol per expiry, 6% Annual Volatility should be input as 6/100
+        :param rr25: 25 delta risk reversal per expiry, call vol minus put vol
+        :param bf25: 25 delta butterfly per expiry
+        :param rr10: 10 delta risk reversal per expiry, optional
+        :param bf10: 10 delta butterfly per expiry, optional
+        :param day_count: days in year
+        """
+        if pv_ccy not in [ccy[0:3], ccy[3:6]]:
+            raise Exception("PV CCY has to be either the domestic or foreign currency of the pair")
+        self._ccy = ccy
+        self._pv_ccy = pv_ccy
+        self._trade_date = trade_date
+        self._day_count = day_count
+        self._time_to_expiry = np.array([Instrument.year_fraction(trade_date, expiry_date, day_count)
+                                         for expiry_date in expiry_dates])
+        if np.any(np.diff(self._time_to_expiry) <= 0) or self._time_to_expiry[0] <= 0:
+            raise Exception("expiry_dates must be after trade_date and strictly increasing")
+        self._spot = spot
+        self._rd = np.broadcast_to(np.asarray(rd, dtype=float), self._time_to_expiry.shape)
+        self._rf = np.broadcast_to(np.asarray(rf, dtype=float), self._time_to_expiry.shape)
+        self._quotes = self._check_quotes({'atm': atm, 'rr25': rr25, 'bf25': bf25, 'rr10': rr10, 'bf10': bf10})
+        self._book_strike = None
+        self._book_time_to_expiry = None
+        self._build()
+
+    @property
+    def ccy(self):
+        return self._ccy
+
+    @property
+    def pv_ccy(self):
+        return self._pv_ccy
+
+    @property
+    def time_to_expiry(self):
+        return self._time_to_expiry
+
+    @property
+    def pillar_strikes(self):
+        return self._pillar_strikes
+
+    @property
+    def pillar_vols(self):
+        return self._pillar_vols
+
+    @property
+    def premium_adjusted(self):
+        return self._pv_ccy == self._ccy[0:3]
+
+    def forward(self, *, time_to_expiry):
+        """
+        :param time_to_expiry: array of year fractions
+        :return: forwards with rates interpolated linearly between pillars
+        """
+        rd = np.interp(time_to_expiry, self._time_to_expiry, self._rd)
+        rf = np.interp(time_to_expiry, self._time_to_expiry, self._rf)
+        return self._spot * np.exp((rd - rf) * time_to_expiry)
+
+    def remark(self, *, spot=None, rd=None, rf=None, atm=None, rr25=None, bf25=None, rr10=None, bf10=None):
+        """
+        Updates the quotes that have ticked and rebuilds all pillars in one vectorized solve
+        """
+        if spot is not None:
+            self._spot = spot
+        if rd is not None:
+            self._rd = np.broadcast_to(np.asarray(rd, dtype=float), self._time_to_expiry.shape)
+        if rf is not None:
+            self._rf = np.broadcast_to(np.asarray(rf, dtype=float), self._time_to_expiry.shape)
+        quotes = dict(self._quotes)
+        for quote, value in {'atm': atm, 'rr25': rr25, 'bf25': bf25, 'rr10': rr10, 'bf10': bf10}.items():
+            if value is not None:
+                quotes[quote] = value
+        self._quotes = self._check_quotes(quotes)
+        self._build()
+
+    @staticmethod
+    def _check_quotes(quotes):
+        if (quotes['rr10'] is None) != (quotes['bf10'] is None):
+            raise Exception("rr10 and bf10 must be given together to build the 10 delta pillars")
+        return quotes
+
+    def _build(self):
+        atm = np.asarray(self._quotes['atm'], dtype=float)
+        rr25 = np.asarray(self._quotes['rr25'], dtype=float)
+        bf25 = np.asarray(self._quotes['bf25'], dtype=float)
+        time_to_expiry = self._time_to_expiry
+        forward = self.forward(time_to_expiry=time_to_expiry)
+        spot_delta = time_to_expiry <= 1
+
+        # atm delta neutral straddle strike
+        atm_strike = forward * np.exp((-0.5 if self.premium_adjusted else 0.5) * atm ** 2 * time_to_expiry)
+
+        deltas = [-0.25, 0.25]
+        vols = [atm + bf25 - rr25 / 2, atm + bf25 + rr25 / 2]
+        if self._quotes['rr10'] is not None:
+            rr10 = np.asarray(self._quotes['rr10'], dtype=float)
+            bf10 = np.asarray(self._quotes['bf10'], dtype=float)
+            deltas = [-0.10] + deltas + [0.10]
+            vols = [atm + bf10 - rr10 / 2] + vols + [atm + bf10 + rr10 / 2]
+        deltas = np.array(deltas)[None, :]
+        vols = np.stack(vols, axis=1)
+
+        strikes = self.strike_from_delta(delta=deltas, forward=forward[:, None],
+                                         time_to_expiry=time_to_expiry[:, None], sigma=vols,
+                                         rf=self._rf[:, None], premium_adjusted=self.premium_adjusted,
+                                         spot_delta=spot_delta[:, None])
+
+        # pillars ordered by increasing strike: puts, atm, calls
+        middle = strikes.shape[1] // 2
+        self._pillar_strikes = np.concatenate([strikes[:, :middle], atm_strike[:, None], strikes[:, middle:]], axis=1)
+        self._pillar_vols = np.concatenate([vols[:, :middle], atm[:, None], vols[:, middle:]], axis=1)
+        self._pillar_moneyness = np.log(self._pillar_strikes / forward[:, None]) / np.sqrt(time_to_expiry[:, None])
+
+    @staticmethod
+    def strike_from_delta(*, delta, forward, time_to_expiry, sigma, rf, premium_adjusted=False, spot_delta=True,
+                          iterations=60):
+        """
+        :param delta: array of deltas, positive for calls and negative for puts, so -0.25 is a 25 delta put
+        :param forward: forward rate
+        :param time_to_expiry: year fraction to expiry
+        :param sigma: annual log normal volatility, 6% Annual Volatility should be input as 6/100
+        :param rf: cost of funding in foreign currency, used to convert spot deltas to forward deltas
+        :param premium_adjusted: True if the deltas include the premium paid in foreign currency
+        :param spot_delta: True for spot deltas, False for forward deltas
+        :param iterations: bisection iterations for premium adjusted deltas, which have no closed form
+        :return: array of strikes, all inputs are broadcast against each other
+        """
+        delta = np.asarray(delta, dtype=float)
+        phi = np.where(delta >= 0, 1.0, -1.0)
+        stdev = sigma * np.sqrt(time_to_expiry)
+        forward_delta = delta / np.where(spot_delta, np.exp(-rf * time_to_expiry), 1.0)
+
+        # unadjusted forward delta is phi * N(phi * d1)
+        d1 = phi * sp.norm.ppf(phi * forward_delta)
+        strike = forward * np.exp(-stdev * d1 + 0.5 * stdev ** 2)
+        if not np.any(premium_adjusted):
+            return strike
+
+        # premium adjusted forward delta is phi * K/F * N(phi * d2), solved for d2 by bisection
+        forward_delta, stdev, phi = np.broadcast_arrays(forward_delta, stdev, phi)
+        lower = np.full(forward_delta.shape, -10.0)
+        upper = np.full(forward_delta.shape, 10.0)
+
+        # call delta peaks where n(d2) = stdev * N(d2), only strikes above the peak are used
+        peak_lower, peak_upper = lower.copy(), upper.copy()
+        for _ in range(iterations):
+            mid = 0.5 * (peak_lower + peak_upper)
+            below_peak = sp.norm.pdf(mid) > stdev * sp.norm.cdf(mid)
+            peak_lower = np.where(below_peak, mid, peak_lower)
+            peak_upper = np.where(below_peak, peak_upper, mid)
+        upper = np.where(phi > 0, peak_lower, upper)
+
+        # the signed premium adjusted delta is increasing in d2 on the bracket for both calls and puts
+        for _ in range(iterations):
+            mid = 0.5 * (lower + upper)
+            value = phi * sp.norm.cdf(phi * mid) * np.exp(-stdev * mid - 0.5 * stdev ** 2)
+            too_low = value < forward_delta
+            lower = np.where(too_low, mid, lower)
+            upper = np.where(too_low, upper, mid)
+        d2 = 0.5 * (lower + upper)
+        adjusted_strike = forward * np.exp(-stdev * d2 - 0.5 * stdev ** 2)
+        return np.where(premium_adjusted, adjusted_strike, strike)
+
+    @staticmethod
+    def _interp_smile(moneyness, vols, rows, z):
+        # piecewise linear in moneyness on the pillars of the given rows, flat extrapolation in the wings
+        pillar_z = moneyness[rows]
+        pillar_v = vols[rows]
+        k = np.clip((pillar_z < z[:, None]).sum(axis=1), 1, pillar_z.shape[1] - 1)
+        trades = np.arange(len(z))
+        z0, z1 = pillar_z[trades, k - 1], pillar_z[trades, k]
+        v0, v1 = pillar_v[trades, k - 1], pillar_v[trades, k]
+        weight = np.clip((z - z0) / (z1 - z0), 0.0, 1.0)
+        return v0 + weight * (v1 - v0)
+
+    def vol(self, *, strike, time_to_expiry):
+        """
+        :param strike: array of strikes
+        :param time_to_expiry: array of year fractions to expiry, floored at MIN_TIME_TO_EXPIRY as in Option
+        :return: array of vols, linear in moneyness log(K/F)/sqrt(T) on each smile and linear in total
+        variance between expiries, flat outside the first and last expiry
+        """
+        strike, time_to_expiry = np.broadcast_arrays(np.asarray(strike, dtype=float),
+                                                     np.maximum(np.asarray(time_to_expiry, dtype=float),
+                                                                MIN_TIME_TO_EXPIRY))
+        strike, time_to_expiry = strike.ravel(), time_to_expiry.ravel()
+        pillars = self._time_to_expiry
+        z = np.log(strike / self.forward(time_to_expiry=time_to_expiry)) / np.sqrt(time_to_expiry)
+
+        upper = np.clip(np.searchsorted(pillars, time_to_expiry), 1, len(pillars) - 1)
+        lower = upper - 1
+        if len(pillars) == 1:
+            upper = lower = np.zeros_like(upper)
+        vol_lower = self._interp_smile(self._pillar_moneyness, self._pillar_vols, lower, z)
+        vol_upper = self._interp_smile(self._pillar_moneyness, self._pillar_vols, upper, z)
+
+        t0, t1 = pillars[lower], pillars[upper]
+        t = np.clip(time_to_expiry, t0, t1)
+        weight = np.where(t1 > t0, (t - t0) / np.where(t1 > t0, t1 - t0, 1.0), 0.0)
+        variance = (1 - weight) * vol_lower ** 2 * t0 + weight * vol_upper ** 2 * t1
+        return np.sqrt(variance / t)
+
+    def vol_options(self, *, options):
+        """
+        :param options: list of FXOption objects on the same currency pair as the smile
+        :return: array of vols, one per option
+        """
+        strike, time_to_expiry = self._book_arrays(options)
+        return self.vol(strike=strike, time_to_expiry=time_to_expiry)
+
+    def load_book(self, *, options):
+        """
+        Precomputes strikes and times to expiry of a book of FXOptions once, so that re-marking the book after
+        remark only needs the vectorized interpolation in book_vols
+        :param options: list of FXOption objects on the same currency pair as the smile
+        """
+        self._book_strike, self._book_time_to_expiry = self._book_arrays(options)
+
+    def book_vols(self):
+        """
+        :return: array of vols for the book passed to load_book, at the current quotes
+        """
+        if self._book_strike is None:
+            raise Exception("load_book must be called before book_vols")
+        return self.vol(strike=self._book_strike, time_to_expiry=self._book_time_to_expiry)
+
+    def _book_arrays(self, options):
+        if np.any(np.array([option.ccy for option in options]) != self._ccy):
+            raise Exception("all options must be on the currency pair " + self._ccy)
+        strike = np.array([option.strike for option in options], dtype=float)
+        expiry_date = np.array([option.expiry_date for option in options], dtype='datetime64[us]')
+        return strike, Instrument.year_fraction(self._trade_date, expiry_date, self._day_count)
+
+
+if __name__ == '__main__':
+    trade_date = datetime.datetime(2017, 1, 31)
+    eurusd_smile = FXSmile(ccy='EURUSD', pv_ccy='USD', trade_date=trade_date,
+                           expiry_dates=[datetime.datetime(2017, 2, 28), datetime.datetime(2017, 7, 31),
+                                         datetime.datetime(2018, 1, 31), datetime.datetime(2019, 1, 31)],
+                           spot=1.14, rd=25e-4, rf=-50 / 1e4,
+                           atm=np.array([6.5, 6.8, 7.0, 7.3]) / 100, rr25=np.array([-0.4, -0.6, -0.8, -1.0]) / 100,
+                           bf25=np.array([0.20, 0.25, 0.30, 0.35]) / 100, rr10=np.array([-0.8, -1.1, -1.5, -1.9]) / 100,
+                           bf10=np.array([0.7, 0.9, 1.1, 1.3]) / 100)
+    print('EURUSD pillar strikes: \n', eurusd_smile.pillar_strikes)
+    print('EURUSD pillar vols: \n', eurusd_smile.pillar_vols)
+
+    usdjpy_smile = FXSmile(ccy='USDJPY', pv_ccy='USD', trade_date=trade_date,
+                           expiry_dates=[datetime.datetime(2018, 1, 31)], spot=110, rd=25e-4, rf=0,
+                           atm=np.array([9.0]) / 100, rr25=np.array([-1.2]) / 100, bf25=np.array([0.3]) / 100)
+    print('USDJPY premium adjusted pillar strikes: ', usdjpy_smile.pillar_strikes)
+
+    eurusd_call = FXOption(name='EURUSD', trade_date=trade_date,
+                           expiry_date=datetime.datetime(2018, 1, 31), call_or_put='call',
+                           strike=1.20, day_count=365, pv_ccy='USD', ccy='EURUSD')
+    sigma = eurusd_smile.vol_options(options=[eurusd_call])[0]
+    print('smile vol for 1.20 call: ', sigma)
+    print('PV for 1 unit of 1.20 call: ', eurusd_call.pv(spot=1.14, sigma=sigma, rd=25e-4, rf=-50 / 1e4))
+
+    n = 100000
+    book = [FXOption(name='EURUSD', trade_date=trade_date,
+                     expiry_date=trade_date + datetime.timedelta(days=int(days)), call_or_put='call',
+                     strike=strike, day_count=365, pv_ccy='USD', ccy='EURUSD')
+            for days, strike in zip(np.random.randint(7, 1000, n), np.random.uniform(1.0, 1.3, n))]
+    eurusd_smile.load_book(options=book)
+    start = datetime.datetime.now()
+    eurusd_smile.remark(spot=1.145, atm=np.array([6.6, 6.9, 7.1, 7.4]) / 100)
+    vols = eurusd_smile.book_vols()
+    print('re-marked ', n, ' trades in ', datetime.datetime.now() - start)
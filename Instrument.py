@@ -1,6 +1,41 @@
 from abc import ABC
+import copy
+import datetime as datetime
+import numpy as np
 
 
 class Instrument(ABC):
     def __init__(self):
         pass
+
+    @staticmethod
+    def year_fraction(start_date, end_date, day_count):
+        """
+        :param start_date: datetime or array of datetime64
+        :param end_date: datetime or array of datetime64
+        :param day_count: days in year
+        :return: number of whole days between the dates over day_count, broadcast over array inputs,
+        elapsed time is floored to whole days in the same way as timedelta.days
+        """
+        days = (np.asarray(end_date, dtype='datetime64[us]') - np.asarray(start_date, dtype='datetime64[us]')) \
+            // np.timedelta64(1, 'D')
+        return days / day_count
+
+    @classmethod
+    def stack(cls, instruments):
+        """
+        :param instruments: list of instruments of the same class
+        :return: a single instrument whose attributes are column arrays with one row per instrument,
+        so that pv and greeks evaluate the whole list in one broadcasted call
+        """
+        if any(type(instrument) is not type(instruments[0]) for instrument in instruments):
+            raise Exception("instruments must all be of the same class to be stacked")
+        stacked = copy.copy(instruments[0])
+        for key, value in vars(instruments[0]).items():
+            values = [vars(instrument)[key] for instrument in instruments]
+            if isinstance(value, datetime.datetime):
+                values = np.array(values, dtype='datetime64[us]')
+            else:
+                values = np.array(values)
+            setattr(stacked, key, values[:, None])
+        return stacked
@@ -2,11 +2,21 @@ from abc import ABC, abstractmethod
 from Instrument import Instrument
 import numpy as np
 import scipy.stats as sp
+from scipy.special import ndtr
 import datetime as datetime
 import json
 
 
+CALLS = ['c', 'call', 'pay', 'payer']
+PUTS = ['p', 'put', 'rec', 'receiver']
+# floor on year fractions to expiry, options on or after expiry are then worth their intrinsic value
+MIN_TIME_TO_EXPIRY = 1e-10
+
+
 class Option(Instrument):
+    # notional that one unit of the pv/greek outputs refers to, used to scale greeks into currency amounts
+    notional_unit = 1
+
     def __init__(self, name, trade_date, expiry_date, call_or_put, strike, day_count, pv_ccy):
         self._name = name
         self._trade_date = trade_date
@@ -97,6 +107,80 @@ class Option(Instrument):
     def vega(self):
         pass
 
+    @staticmethod
+    def call_or_put_sign(call_or_put):
+        """
+        :param call_or_put: option type or array of option types
+        :return: 1 for calls/payers and -1 for puts/receivers
+        """
+        call_or_put = np.char.lower(np.asarray(call_or_put, dtype=str))
+        sign = np.where(np.isin(call_or_put, CALLS), 1.0, np.where(np.isin(call_or_put, PUTS), -1.0, np.nan))
+        if np.any(np.isnan(sign)):
+            raise Exception("Option Type has to be one of ['c', 'call', 'rec', 'receiver','p','put','pay','payer']")
+        return sign
+
+    def time_to_expiry(self, *, horizon_dates=None):
+        """
+        :param horizon_dates: optional list or array of dates to evaluate from instead of trade_date
+        :return: year fraction to expiry, an array over horizon_dates if given, floored at MIN_TIME_TO_EXPIRY
+        so that horizons on or after expiry return the value at expiry
+        """
+        start_date = self._trade_date if horizon_dates is None else np.asarray(horizon_dates, dtype='datetime64[us]')
+        return np.maximum(self.year_fraction(start_date, self._expiry_date, self._day_count), MIN_TIME_TO_EXPIRY)
+
+    @classmethod
+    def horizon(cls, *, options, horizon_dates, greeks=('pv', 'delta', 'gamma', 'vega'), bumps=None, **market):
+        """
+        :param options: list of options of this class
+        :param horizon_dates: list or array of dates to project to
+        :param greeks: names of the methods to evaluate
+        :param bumps: optional dict of greek name to bump, eg {'delta': 10e-4, 'gamma': 10e-4} for FX options
+        :param market: keyword inputs of the pv method of the class, each either a scalar, a 1-d array with one
+        value per option or one value per horizon date (a spot/vol path), or a 2-d array broadcastable to the
+        options x dates grid. A 1-d array is ambiguous when there are as many options as dates and has to be
+        passed as a column (per option) or a row (per date) instead.
+        Lists of instruments (eg one cds per swaption) are stacked in the same way as the options
+        :return: dict of greek name to an options x dates grid, evaluated in one broadcasted call per greek
+        """
+        if any(not isinstance(option, cls) for option in options):
+            raise Exception("options must all be of type " + cls.__name__)
+        book = cls.stack(options)
+        shape = (len(options), len(horizon_dates))
+        market = {key: cls._horizon_input(key, value, shape) for key, value in market.items()}
+        bumps = {} if bumps is None else bumps
+        grid = {}
+        for greek in greeks:
+            bump = {'bump': bumps[greek]} if greek in bumps else {}
+            value = np.asarray(getattr(book, greek)(horizon_dates=horizon_dates, **bump, **market))
+            grid[greek] = value if value.shape == shape else np.broadcast_to(value, shape).copy()
+        return grid
+
+    @staticmethod
+    def _horizon_input(key, value, shape):
+        # lines up a market input of Option.horizon with the options x dates grid
+        if isinstance(value, list) and len(value) > 0 and isinstance(value[0], Instrument):
+            if len(value) != shape[0]:
+                raise Exception(key + " must have one instrument per option")
+            return Instrument.stack(value)
+        if isinstance(value, Instrument):
+            return value
+        array = np.asarray(value)
+        if array.ndim == 0:
+            return value
+        if array.ndim == 1:
+            if len(array) == shape[0] == shape[1] and shape[0] > 1:
+                raise Exception(key + " is ambiguous with as many options as horizon dates, pass a column of shape "
+                                + str((shape[0], 1)) + " per option or a row of shape " + str((1, shape[1]))
+                                + " per date")
+            if len(array) == shape[1]:
+                return array
+            if len(array) == shape[0]:
+                return array[:, None]
+        elif array.ndim == 2 and array.shape[0] in (1, shape[0]) and array.shape[1] in (1, shape[1]):
+            return array
+        raise Exception(key + " of shape " + str(array.shape) + " does not match " + str(shape[0])
+                        + " options x " + str(shape[1]) + " horizon dates")
+
     @staticmethod
     def blackscholes(forward, strike, time_to_expiry, sigma, call_or_put):
 
@@ -104,13 +188,10 @@ class Option(Instrument):
 
         d2 = d1 - sigma * np.sqrt(time_to_expiry)
 
-        if call_or_put.lower() in ['call', 'c']:
-
-            price = forward * sp.norm.cdf(d1) - strike * sp.norm.cdf(d2)
-
-        elif call_or_put.lower() in ['put', 'p']:
+        phi = Option.call_or_put_sign(call_or_put)
 
-            price = strike * sp.norm.cdf(-d2) - forward * sp.norm.cdf(-d1)
+        # ndtr is the standard normal cdf without the argument checks of sp.norm.cdf, which dominate on large grids
+        price = phi * (forward * ndtr(phi * d1) - strike * ndtr(phi * d2))
 
         return price
 
@@ -119,12 +200,8 @@ class Option(Instrument):
 
         d = (forward - strike) / (sigma * np.sqrt(time_to_expiry))
 
-        if call_or_put.lower() in ['call', 'c']:
+        phi = Option.call_or_put_sign(call_or_put)
 
-            price = (sp.norm.pdf(d) + d * sp.norm.cdf(d)) * sigma * np.sqrt(time_to_expiry)
+        price = (sp.norm.pdf(d) + phi * d * ndtr(phi * d)) * sigma * np.sqrt(time_to_expiry)
 
-        elif call_or_put.lower() in ['put', 'p']:
-
-            price = (sp.norm.pdf(d) - d * sp.norm.cdf(-d)) * sigma * np.sqrt(time_to_expiry)
-
-        return price
\ No newline at end of file
+        return price
@@ -3,6 +3,8 @@ import datetime as datetime
 
 
 class RatesSwaption(Option):
+    # pv and greeks are quoted per 10000 notional
+    notional_unit = 1e4
 
     def __init__(self, *, name, trade_date, expiry_date, pay_or_rec, strike, day_count, pv_ccy):
 
@@ -11,64 +13,63 @@ class RatesSwaption(Option):
     def __str__(self):
         return super().__str__()
 
-    def pv(self, *, forward, sigma, annuity):
+    def pv(self, *, forward, sigma, annuity, horizon_dates=None):
         """
         :param forward: Forward is in basis points
         :param sigma: Sigma is Annual Black Normal Volatility in Basis Points/Yr
         :param annuity: Annuity is per 10000 Notional, so for a 10yr swap, approximately 10
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return:   PV is returned in bps upfront
         """
 
-        time_to_expiry = (self._expiry_date - self._trade_date).days/self._day_count
+        time_to_expiry = self.time_to_expiry(horizon_dates=horizon_dates)
 
-        if self._call_or_put.lower() in ['pay', 'payer']:
-            call_or_put = 'call'
-        elif self._call_or_put.lower() in ['rec', 'receiver']:
-            call_or_put = 'put'
-
-        bps_running = super().blacknormal(forward, self._strike, time_to_expiry, sigma, call_or_put)
+        bps_running = super().blacknormal(forward, self._strike, time_to_expiry, sigma, self._call_or_put)
         bps_upfront = annuity * bps_running
 
         return bps_upfront
 
-    def delta(self, *, forward, sigma, annuity, bump=10):
+    def delta(self, *, forward, sigma, annuity, bump=10, horizon_dates=None):
         """
         :param forward: Forward is in basis points
         :param sigma: Sigma is Annual Black Normal Volatility in Basis Points/Yr
         :param annuity: Annuity is per 10000 Notional, so for a 10yr swap, approximately 10
         :param bump: the amount by which the forward is bumped to calculate the numerical dv01
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: the returned value is dv01/10000 Notional, payers have positive dv01 and receivers negative dv01
         """
-        pv_up = self.pv(forward=forward + bump, sigma=sigma, annuity=annuity)
-        pv_down = self.pv(forward=forward - bump, sigma=sigma, annuity=annuity)
+        pv_up = self.pv(forward=forward + bump, sigma=sigma, annuity=annuity, horizon_dates=horizon_dates)
+        pv_down = self.pv(forward=forward - bump, sigma=sigma, annuity=annuity, horizon_dates=horizon_dates)
 
         return (pv_up - pv_down)/bump/2.0
 
-    def gamma(self, *, forward, sigma, annuity, bump=1):
+    def gamma(self, *, forward, sigma, annuity, bump=1, horizon_dates=None):
         """
         :param forward: Forward is in basis points
         :param sigma: Sigma is Annual Black Normal Volatility in Basis Points/Yr
         :param annuity: Annuity is per 10000 Notional, so for a 10yr swap, approximately 10
         :param bump: the amount by which the forward is bumped to calculate the numerical gamma
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: the returned value is gamma/10000 Notional,
         """
 
-        delta_up = self.delta(forward=forward + bump, sigma=sigma, annuity=annuity)
-        delta_down = self.delta(forward=forward - bump, sigma=sigma, annuity=annuity)
+        delta_up = self.delta(forward=forward + bump, sigma=sigma, annuity=annuity, horizon_dates=horizon_dates)
+        delta_down = self.delta(forward=forward - bump, sigma=sigma, annuity=annuity, horizon_dates=horizon_dates)
 
         return (delta_up - delta_down)/bump/2
 
-    def vega(self, *, forward, sigma, annuity, bump=5):
+    def vega(self, *, forward, sigma, annuity, bump=5, horizon_dates=None):
         """
         :param forward: Forward is in basis points
         :param sigma: Sigma is Annual Black Normal Volatility in Basis Points/Yr
         :param annuity: Annuity is per 10000 Notional, so for a 10yr swap, approximately 10
         :param bump: the amount by which the sigma is bumped to calculate the numerical gamma
+        :param horizon_dates: optional list of dates to evaluate from instead of trade_date, returns an array over dates
         :return: the returned value is vega/10000 Notional,
         """
 
-        pv_up = self.pv(forward=forward, sigma=sigma + bump, annuity=annuity)
-        pv_down = self.pv(forward=forward, sigma=sigma - bump, annuity=annuity)
+        pv_up = self.pv(forward=forward, sigma=sigma + bump, annuity=annuity, horizon_dates=horizon_dates)
+        pv_down = self.pv(forward=forward, sigma=sigma - bump, annuity=annuity, horizon_dates=horizon_dates)
 
         return (pv_up - pv_down)/bump/2
 
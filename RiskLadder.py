@@ -0,0 +1,167 @@
+from EquityIndexOption import EquityIndexOption
+from FXOption import FXOption
+from RatesSwaption import RatesSwaption
+import datetime as datetime
+import numpy as np
+
+
+# default expiry ladder as (label, upper edge in years), trades beyond the last pillar fall in an overflow bucket
+# and trades already past expiry in a leading 'expired' bucket
+EXPIRY_LADDER = (('1W', 7 / 365), ('1M', 1 / 12), ('3M', 3 / 12), ('6M', 6 / 12), ('1Y', 1.0),
+                 ('2Y', 2.0), ('5Y', 5.0), ('10Y', 10.0))
+
+
+class RiskLadder:
+    """
+    Aggregates greeks of a book of options into underlying x expiry x strike x currency ladders.
+    Bucket indices are computed once per book with bucket/bucket_options, every subsequent aggregation is a
+    single bincount pass per greek over the precomputed flat bucket index, so re-aggregating after a re-price
+    costs a few milliseconds even for millions of trades.
+    Greeks are scaled into pv currency amounts with notional / notional_unit, notional_unit being 1 for greeks
+    quoted per unit of underlying (equity index, fx) and 10000 for greeks quoted per 10000 notional or in bps
+    upfront (rates swaptions, cds swaptions)
+    An absolute strike ladder only makes sense for a single underlying, books with several underlyings
+    (eg SPX and NKY index points, fx rates, bps) have to be bucketed by moneyness by passing reference levels
+    """
+
+    def __init__(self, *, expiry_ladder=EXPIRY_LADDER, strike_ladder=None):
+        """
+        :param expiry_ladder: sequence of (label, upper edge in years), edges must be increasing
+        :param strike_ladder: sequence of (label, upper edge) applied to strike or moneyness, None for a single bucket
+        """
+        self._expiry_labels, self._expiry_edges = self._ladder(expiry_ladder, 'expiry_ladder')
+        self._expiry_labels = ['expired'] + self._expiry_labels
+        if strike_ladder is None:
+            self._strike_labels, self._strike_edges = ['all'], np.array([])
+        else:
+            self._strike_labels, self._strike_edges = self._ladder(strike_ladder, 'strike_ladder')
+        self._underlying_labels = None
+        self._ccy_labels = None
+        self._flat_index = None
+        self._scale = None
+
+    @staticmethod
+    def _ladder(ladder, name):
+        labels = [str(label) for label, _ in ladder]
+        edges = np.array([edge for _, edge in ladder], dtype=float)
+        if len(edges) == 0 or np.any(np.diff(edges) <= 0):
+            raise Exception(name + " edges must be non empty and strictly increasing")
+        return labels + [labels[-1] + '+'], edges
+
+    @property
+    def shape(self):
+        return (len(self._underlying_labels), len(self._expiry_labels),
+                len(self._strike_labels), len(self._ccy_labels))
+
+    @property
+    def labels(self):
+        return {'underlying': self._underlying_labels, 'expiry': self._expiry_labels,
+                'strike': self._strike_labels, 'ccy': self._ccy_labels}
+
+    def bucket(self, *, underlying, time_to_expiry, strike, ccy, reference=None, notional_unit=1):
+        """
+        :param underlying: array of underlying names, one per trade
+        :param time_to_expiry: array of year fractions to expiry, negative for trades already past expiry
+        :param strike: array of strikes, in a single unit across the book unless reference is given
+        :param ccy: array of pv currencies
+        :param reference: optional array of spot/forward levels, strikes are then bucketed by moneyness strike/reference,
+        required with a strike ladder when the book has more than one underlying
+        :param notional_unit: scalar or array of notional that one unit of greek refers to, see Option.notional_unit
+        :return: self, with the integer bucket indices stored for aggregate
+        """
+        self._underlying_labels, underlying_index = np.unique(np.asarray(underlying, dtype=str), return_inverse=True)
+        self._ccy_labels, ccy_index = np.unique(np.asarray(ccy, dtype=str), return_inverse=True)
+        if reference is None and len(self._strike_edges) > 0 and len(self._underlying_labels) > 1:
+            raise Exception("reference levels are required to bucket strikes of a book with several underlyings")
+
+        time_to_expiry = np.asarray(time_to_expiry, dtype=float)
+        expiry_index = np.where(time_to_expiry < 0, 0,
+                                np.searchsorted(self._expiry_edges, time_to_expiry, side='left') + 1)
+
+        strike = np.asarray(strike, dtype=float)
+        if reference is not None:
+            strike = strike / np.asarray(reference, dtype=float)
+        strike_index = np.searchsorted(self._strike_edges, strike, side='left')
+
+        self._flat_index = np.ravel_multi_index((underlying_index.ravel(), expiry_index, strike_index,
+                                                 ccy_index.ravel()), self.shape)
+        self._scale = 1.0 / np.asarray(notional_unit, dtype=float)
+        return self
+
+    def bucket_options(self, *, options, underlying=None, reference=None):
+        """
+        :param options: list of Option objects (EquityIndexOption, FXOption, RatesSwaption, CDSSwaption)
+        :param underlying: optional array of underlying names, defaults to the ccy pair for FXOptions and the
+        index name for EquityIndexOptions. Required for swaptions, whose names are trade labels
+        :param reference: optional array of spot/forward levels for moneyness strike buckets,
+        required with a strike ladder when the book has more than one underlying
+        :return: self, with the integer bucket indices stored for aggregate
+        """
+        if underlying is None:
+            if any(not isinstance(option, (EquityIndexOption, FXOption)) for option in options):
+                raise Exception("underlying must be given for books with swaptions, their names are trade labels")
+            underlying = [option.ccy if isinstance(option, FXOption) else option.name for option in options]
+        # not floored at expiry like Option.time_to_expiry so that expired trades get their own bucket
+        time_to_expiry = np.array([option.year_fraction(option.trade_date, option.expiry_date, option.day_count)
+                                   for option in options])
+        return self.bucket(underlying=underlying,
+                           time_to_expiry=time_to_expiry,
+                           strike=[option.strike for option in options],
+                           ccy=[option.pv_ccy for option in options],
+                           reference=reference,
+                           notional_unit=np.array([option.notional_unit for option in options], dtype=float))
+
+    def aggregate(self, *, notional, **greeks):
+        """
+        :param notional: scalar or array of trade notionals, negative for short positions
+        :param greeks: arrays of per trade greeks in the units returned by the option classes, e.g. delta=..., vega=...
+        :return: dict of greek name to ladder of pv currency amounts, shaped (underlying, expiry, strike, ccy)
+        """
+        if self._flat_index is None:
+            raise Exception("bucket or bucket_options must be called before aggregate")
+        weight = np.asarray(notional, dtype=float) * self._scale
+        size = int(np.prod(self.shape))
+        ladders = {}
+        for greek, values in greeks.items():
+            weights = np.broadcast_to(np.asarray(values, dtype=float) * weight, self._flat_index.shape)
+            ladders[greek] = np.bincount(self._flat_index, weights=weights, minlength=size).reshape(self.shape)
+        return ladders
+
+    @staticmethod
+    def collapse(ladder, *, keep=('underlying', 'expiry')):
+        """
+        :param ladder: ladder returned by aggregate
+        :param keep: axes to keep out of 'underlying', 'expiry', 'strike', 'ccy'
+        :return: ladder summed over the remaining axes
+        """
+        axes = ('underlying', 'expiry', 'strike', 'ccy')
+        return ladder.sum(axis=tuple(i for i, axis in enumerate(axes) if axis not in keep))
+
+
+if __name__ == '__main__':
+    spx_call = EquityIndexOption(name='SPX', trade_date=datetime.datetime(2017, 1, 31),
+                                 expiry_date=datetime.datetime(2018, 1, 31), call_or_put='call',
+                                 strike=4400, day_count=365, pv_ccy='USD')
+    payr_swaption = RatesSwaption(name='RatesPayer', trade_date=datetime.datetime(2019, 8, 5),
+                                  expiry_date=datetime.datetime(2019, 11, 5), pay_or_rec='Payer',
+                                  strike=160, day_count=365, pv_ccy='USD')
+
+    ladder = RiskLadder().bucket_options(options=[spx_call, payr_swaption], underlying=['SPX', 'USD 10Y'])
+    delta = [spx_call.delta(spot=4400, sigma=16 / 100, rd=0.02, rf=0.02),
+             payr_swaption.delta(forward=160, sigma=78, annuity=9.2)]
+    vega = [spx_call.vega(spot=4400, sigma=16 / 100, rd=0.02, rf=0.02),
+            payr_swaption.vega(forward=160, sigma=78, annuity=9.2)]
+    risk = ladder.aggregate(notional=[1000, 100e6], delta=delta, vega=vega)
+    print(ladder.labels)
+    print('delta by underlying and expiry: \n', RiskLadder.collapse(risk['delta']))
+    print('vega by underlying and expiry: \n', RiskLadder.collapse(risk['vega']))
+
+    n = 1000000
+    book = RiskLadder(strike_ladder=(('90%', 0.9), ('100%', 1.0), ('110%', 1.1)))
+    book.bucket(underlying=np.random.choice(['SPX', 'SX5E', 'NKY'], n), time_to_expiry=np.random.uniform(0, 12, n),
+                strike=np.random.uniform(3000, 5000, n), ccy=np.random.choice(['USD', 'EUR', 'JPY'], n),
+                reference=4000)
+    start = datetime.datetime.now()
+    risk = book.aggregate(notional=np.random.uniform(-1e3, 1e3, n), delta=np.random.uniform(-1, 1, n),
+                          gamma=np.random.uniform(0, 1e-3, n), vega=np.random.uniform(0, 20, n))
+    print('aggregated delta/gamma/vega for ', n, ' trades in ', datetime.datetime.now() - start)